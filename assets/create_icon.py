@@ -16,20 +16,21 @@ draw = ImageDraw.Draw(img)
 # Fundo arredondado (retângulo com cantos)
 draw.rounded_rectangle([0, 0, SIZE - 1, SIZE - 1], radius=56, fill=BG)
 
+# Tabela cos/sin a cada 10°: as pás estão a 120° (múltiplo de 10°), logo
+# todos os pontos dos 3 polígonos saem dos mesmos 36 valores
+STEPS = 36
+UNIT = [(math.cos(math.radians(j * 10)), math.sin(math.radians(j * 10))) for j in range(STEPS)]
+BLADE_STEP = 120 // 10
+
 # 3 pás da ventoinha (elipses rotacionadas)
 for i in range(3):
-    angle = i * 120
-    rad = math.radians(angle)
+    offset = i * BLADE_STEP
     # Elipse: centro em (0, -55) relativo, rx=18, ry=45
-    cx = CENTER + 55 * math.sin(rad)
-    cy = CENTER - 55 * math.cos(rad)
+    cos_a, sin_a = UNIT[offset]
+    cx = CENTER + 55 * sin_a
+    cy = CENTER - 55 * cos_a
     # Desenhar elipse rotacionada (aproximação com polígono)
-    pts = []
-    for j in range(36):
-        a = math.radians(j * 10 + angle)
-        x = cx + 18 * math.cos(a)
-        y = cy + 45 * math.sin(a)
-        pts.append((x, y))
+    pts = [(cx + 18 * c, cy + 45 * s) for c, s in (UNIT[(j + offset) % STEPS] for j in range(STEPS))]
     draw.polygon(pts, fill=ACCENT, outline=ACCENT_DIM)
 
 # Centro (hub)
@@ -8,8 +8,9 @@ Supports: AN515-44, AN515-46, AN515-56, AN515-58, AN515-57
 import os
 import struct
 import subprocess
+import time
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import Dict, Optional, Tuple
 
 # EC Register addresses (Acer Nitro 5)
 EC_WRITE_ENABLE = 0x03
@@ -22,11 +23,32 @@ EC_CPU_FAN_RPM_LO = 0x13  # byte baixo
 EC_CPU_FAN_RPM_HI = 0x14  # byte alto (se 16-bit)
 EC_GPU_FAN_RPM_LO = 0x15
 EC_GPU_FAN_RPM_HI = 0x16
+# Blocos (início, tamanho) lidos em get_fan_info: só os registos usados, porque
+# o ec_sys faz uma transação EC (lenta) por byte lido
+EC_RPM_RUN = (EC_CPU_FAN_RPM_LO, 4)  # 0x13-0x16
+EC_MODE_RUN = (EC_GPU_FAN_MODE, 2)   # 0x21-0x22
+EC_PCT_RUN = (EC_CPU_FAN_PCT, 4)     # 0x37-0x3A
+EC_FAN_RUNS = (EC_RPM_RUN, EC_MODE_RUN, EC_PCT_RUN)
+
+# Estimativa de RPM a partir de % (~0-5500 RPM típico), pré-calculada
+_RPM_LUT = tuple(i * 55 for i in range(101))
 
 # EC interface paths
 EC_SYS_PATH = Path("/sys/kernel/debug/ec/ec0/io")
 EC_ACPI_PATH = Path("/dev/ec")
 
+# Validade (s) do resultado em cache de is_available()
+AVAILABLE_TTL = 30.0
+# Janela (s) em que EC_WRITE_ENABLE não é reescrito entre escritas seguidas
+WRITE_ENABLE_TTL = 5.0
+
+
+def _ec_byte(buf: Optional[Dict[int, int]], offset: int) -> Optional[int]:
+    """Byte at offset in an EC snapshot, or None if not covered."""
+    if buf is None:
+        return None
+    return buf.get(offset)
+
 
 class NitroBoostError(Exception):
     """Base exception for Nitro Boost operations."""
@@ -44,21 +66,56 @@ class NitroBoost:
     def __init__(self):
         self._ec_path: Optional[Path] = None
         self._use_ec_sys = False
+        self._fd: Optional[int] = None
+        # Buffers reutilizados nas escritas (evita alocar bytes a cada acesso)
+        self._one_byte = bytearray(1)
+        self._mode_buf = bytearray(2)
+        self._available: Optional[Tuple[bool, str]] = None
+        self._available_checked_at = 0.0
+        self._write_enabled_at = 0.0
+        self._modprobe_tried = False
+
+    def __del__(self):
+        self.close()
+
+    def close(self) -> None:
+        """Close the cached EC file descriptor."""
+        fd, self._fd = getattr(self, "_fd", None), None
+        if fd is not None:
+            try:
+                os.close(fd)
+            except OSError:
+                pass
 
     def _detect_ec_interface(self) -> bool:
         """Detect EC interface (ec_sys or acpi_ec)."""
         if EC_SYS_PATH.exists():
-            self._ec_path = EC_SYS_PATH
-            self._use_ec_sys = True
+            self._open_ec(EC_SYS_PATH, True)
             return True
         if EC_ACPI_PATH.exists():
-            self._ec_path = EC_ACPI_PATH
-            self._use_ec_sys = False
+            self._open_ec(EC_ACPI_PATH, False)
             return True
         return False
 
+    def _open_ec(self, path: Path, use_ec_sys: bool) -> None:
+        """Open the EC interface once; reads/writes reuse the fd via pread/pwrite."""
+        if self._fd is not None and self._ec_path == path:
+            return
+        self.close()
+        self._ec_path = path
+        self._use_ec_sys = use_ec_sys
+        for flags in (os.O_RDWR, os.O_RDONLY):
+            try:
+                self._fd = os.open(str(path), flags)
+                return
+            except OSError:
+                continue
+
     def _ensure_ec_sys(self) -> bool:
-        """Ensure ec_sys module is loaded with write support."""
+        """Ensure ec_sys module is loaded with write support (modprobe runs once)."""
+        if self._modprobe_tried:
+            return EC_SYS_PATH.exists()
+        self._modprobe_tried = True
         try:
             result = subprocess.run(
                 ["modprobe", "ec_sys", "write_support=1"],
@@ -77,75 +134,106 @@ class NitroBoost:
         try:
             with open("/proc/cmdline", "r") as f:
                 cmdline = f.read()
-            return "ec_sys.write_support=1" in cmdline or "ec_sys.write_support=1" in cmdline
+            return "ec_sys.write_support=1" in cmdline
         except (IOError, PermissionError):
             return False
 
-    def _write_ec_sys(self, offset: int, value: int) -> bool:
-        """Write to EC via ec_sys debugfs."""
-        if not self._ec_path or not self._ec_path.exists():
-            return False
+    def _write_ec(self, offset: int, value: int) -> bool:
+        """Write byte to EC register (ec_sys debugfs or /dev/ec, same fd interface)."""
+        if self._fd is None:
+            self._detect_ec_interface()
+            if self._fd is None:
+                return False
+        self._one_byte[0] = value & 0xFF
         try:
-            with open(self._ec_path, "r+b") as f:
-                f.seek(offset)
-                f.write(bytes([value]))
-            return True
-        except (IOError, PermissionError, OSError):
+            return os.pwrite(self._fd, self._one_byte, offset) == 1
+        except OSError:
             return False
 
-    def _write_acpi_ec(self, offset: int, value: int) -> bool:
-        """Write to EC via /dev/ec (acpi_ec module)."""
-        if not self._ec_path or not self._ec_path.exists():
-            return False
+    def _read_ec(self, offset: int) -> Optional[int]:
+        """Read byte from EC register."""
+        if self._fd is None:
+            self._detect_ec_interface()
+            if self._fd is None:
+                return None
         try:
-            with open(self._ec_path, "r+b") as f:
-                f.seek(offset)
-                f.write(bytes([value]))
-            return True
-        except (IOError, PermissionError, OSError):
-            return False
+            data = os.pread(self._fd, 1, offset)
+            return data[0] if data else None
+        except OSError:
+            return None
 
-    def _write_ec(self, offset: int, value: int) -> bool:
-        """Write byte to EC register."""
-        if not self._ec_path:
-            if not self._detect_ec_interface():
+    def _write_ec_block(self, offset: int, data: bytearray) -> bool:
+        """Write consecutive EC registers starting at offset with a single pwrite."""
+        if self._fd is None:
+            self._detect_ec_interface()
+            if self._fd is None:
                 return False
-        if not self._ec_path.exists():
+        try:
+            return os.pwrite(self._fd, data, offset) == len(data)
+        except OSError:
             return False
-        if self._use_ec_sys:
-            return self._write_ec_sys(offset, value)
-        return self._write_acpi_ec(offset, value)
 
-    def _read_ec(self, offset: int) -> Optional[int]:
-        """Read byte from EC register."""
-        if not self._ec_path:
-            if not self._detect_ec_interface():
+    def _read_ec_block(self, offset: int, length: int) -> Optional[bytes]:
+        """Read a contiguous range of EC registers with a single pread."""
+        if self._fd is None:
+            self._detect_ec_interface()
+            if self._fd is None:
                 return None
-        if not self._ec_path.exists():
-            return None
         try:
-            with open(self._ec_path, "rb") as f:
-                f.seek(offset)
-                data = f.read(1)
-                return data[0] if data else None
-        except (IOError, PermissionError, OSError):
+            return os.pread(self._fd, length, offset) or None
+        except OSError:
             return None
 
+    def _read_ec_runs(self, runs) -> Optional[Dict[int, int]]:
+        """Read several (offset, length) register runs into a {register: byte} snapshot."""
+        snap: Dict[int, int] = {}
+        for offset, length in runs:
+            block = self._read_ec_block(offset, length)
+            if block:
+                for i, b in enumerate(block):
+                    snap[offset + i] = b
+        return snap or None
+
     def _enable_write(self) -> bool:
-        """Enable EC write access."""
-        return self._write_ec(EC_WRITE_ENABLE, 0x11)
+        """Enable EC write access (skipped if done within WRITE_ENABLE_TTL)."""
+        now = time.monotonic()
+        if self._write_enabled_at and now - self._write_enabled_at < WRITE_ENABLE_TTL:
+            return True
+        if not self._write_ec(EC_WRITE_ENABLE, 0x11):
+            self._write_enabled_at = 0.0
+            return False
+        self._write_enabled_at = now
+        return True
+
+    def _write_fan_modes(self, gpu_mode: int, cpu_mode: int) -> bool:
+        """Write GPU and CPU fan modes (adjacent registers) in one pwrite."""
+        self._mode_buf[0] = gpu_mode
+        self._mode_buf[1] = cpu_mode
+        ok = self._write_ec_block(EC_GPU_FAN_MODE, self._mode_buf)
+        if not ok:
+            # Força nova escrita de EC_WRITE_ENABLE na próxima tentativa
+            self._write_enabled_at = 0.0
+        return ok
 
     def is_available(self) -> Tuple[bool, str]:
         """
         Check if EC control is available.
+        The result is cached for AVAILABLE_TTL seconds.
         Returns (success, message).
         """
+        now = time.monotonic()
+        if self._available is not None and now - self._available_checked_at < AVAILABLE_TTL:
+            return self._available
+        self._available = self._check_available()
+        self._available_checked_at = now
+        return self._available
+
+    def _check_available(self) -> Tuple[bool, str]:
+        """Probe root privileges and the EC interface (uncached)."""
         if os.geteuid() != 0:
             return False, "Requer privilégios de root (sudo)"
 
-        if self._ensure_ec_sys():
-            self._detect_ec_interface()
-
+        self._ensure_ec_sys()
         if not self._detect_ec_interface():
             msg = (
                 "Interface EC não encontrada.\n\n"
@@ -175,18 +263,12 @@ class NitroBoost:
         if not self._enable_write():
             return False
 
-        # Lê estado atual para preservar o que não está sendo alterado
-        cpu_mode = self._read_ec(EC_CPU_FAN_MODE)
-        gpu_mode = self._read_ec(EC_GPU_FAN_MODE)
-
         # CPU: 0x04=auto, 0x08=max, 0x0c=custom
         new_cpu = 0x08 if cpu_max else 0x04
         # GPU: 0x10=auto, 0x20=max, 0x30=custom
         new_gpu = 0x20 if gpu_max else 0x10
 
-        self._write_ec(EC_CPU_FAN_MODE, new_cpu)
-        self._write_ec(EC_GPU_FAN_MODE, new_gpu)
-        return True
+        return self._write_fan_modes(new_gpu, new_cpu)
 
     def set_custom_fan(self, percent: int) -> bool:
         """
@@ -205,20 +287,26 @@ class NitroBoost:
         if not self._enable_write():
             return False
 
-        # Custom mode
-        self._write_ec(EC_GPU_FAN_MODE, 0x30)
-        self._write_ec(EC_CPU_FAN_MODE, 0x0C)
-        self._write_ec(EC_CPU_FAN_PCT, cpu_percent)
-        self._write_ec(EC_GPU_FAN_PCT, gpu_percent)
+        # Custom mode; 0x37 e 0x3A não são contíguos e os registos entre eles
+        # não são reescritos, por isso as percentagens vão em duas escritas
+        if not self._write_fan_modes(0x30, 0x0C):
+            return False
+        if not (self._write_ec(EC_CPU_FAN_PCT, cpu_percent)
+                and self._write_ec(EC_GPU_FAN_PCT, gpu_percent)):
+            self._write_enabled_at = 0.0
+            return False
         return True
 
-    def get_cooler_boost_status(self) -> Optional[bool]:
+    def get_cooler_boost_status(self, buf: Optional[Dict[int, int]] = None) -> Optional[bool]:
         """
         Get current Cooler Boost status.
+        buf: EC snapshot already read by the caller (avoids another read).
         Returns True if max, False if auto/custom, None if unknown.
         """
-        cpu_mode = self._read_ec(EC_CPU_FAN_MODE)
-        gpu_mode = self._read_ec(EC_GPU_FAN_MODE)
+        if buf is None:
+            buf = self._read_ec_runs((EC_MODE_RUN,))
+        cpu_mode = _ec_byte(buf, EC_CPU_FAN_MODE)
+        gpu_mode = _ec_byte(buf, EC_GPU_FAN_MODE)
         if cpu_mode is None or gpu_mode is None:
             return None
         # Max: CPU 0x08, GPU 0x20
@@ -226,10 +314,12 @@ class NitroBoost:
 
     def get_fan_info(self) -> dict:
         """Get fan mode and percentage (CPU/GPU)."""
-        cpu_mode = self._read_ec(EC_CPU_FAN_MODE)
-        gpu_mode = self._read_ec(EC_GPU_FAN_MODE)
-        cpu_pct = self._read_ec(EC_CPU_FAN_PCT)
-        gpu_pct = self._read_ec(EC_GPU_FAN_PCT)
+        # Três leituras curtas cobrem RPM, modos e percentagens
+        buf = self._read_ec_runs(EC_FAN_RUNS)
+        cpu_mode = _ec_byte(buf, EC_CPU_FAN_MODE)
+        gpu_mode = _ec_byte(buf, EC_GPU_FAN_MODE)
+        cpu_pct = _ec_byte(buf, EC_CPU_FAN_PCT)
+        gpu_pct = _ec_byte(buf, EC_GPU_FAN_PCT)
 
         mode = "unknown"
         if cpu_mode is not None and gpu_mode is not None:
@@ -244,12 +334,12 @@ class NitroBoost:
         gpu_cb = gpu_mode == 0x20 if gpu_mode is not None else None
 
         # RPM: tenta EC ou estima a partir de %
-        cpu_rpm = self._read_fan_rpm_ec(EC_CPU_FAN_RPM_LO, EC_CPU_FAN_RPM_HI)
-        gpu_rpm = self._read_fan_rpm_ec(EC_GPU_FAN_RPM_LO, EC_GPU_FAN_RPM_HI)
+        cpu_rpm = self._read_fan_rpm_ec(EC_CPU_FAN_RPM_LO, EC_CPU_FAN_RPM_HI, buf)
+        gpu_rpm = self._read_fan_rpm_ec(EC_GPU_FAN_RPM_LO, EC_GPU_FAN_RPM_HI, buf)
         if cpu_rpm is None and cpu_pct is not None:
-            cpu_rpm = int(cpu_pct * 55)  # ~0-5500 RPM típico
+            cpu_rpm = _RPM_LUT[min(cpu_pct, 100)]
         if gpu_rpm is None and gpu_pct is not None:
-            gpu_rpm = int(gpu_pct * 55)
+            gpu_rpm = _RPM_LUT[min(gpu_pct, 100)]
 
         return {
             "mode": mode,
@@ -257,18 +347,21 @@ class NitroBoost:
             "gpu_percent": gpu_pct if gpu_pct is not None else None,
             "cpu_rpm": cpu_rpm,
             "gpu_rpm": gpu_rpm,
-            "cooler_boost": self.get_cooler_boost_status(),
+            "cooler_boost": self.get_cooler_boost_status(buf),
             "cpu_cooler_boost": cpu_cb,
             "gpu_cooler_boost": gpu_cb,
         }
 
-    def _read_fan_rpm_ec(self, lo_reg: int, hi_reg: Optional[int] = None) -> Optional[int]:
-        """Lê RPM do EC (8 ou 16-bit). Retorna None se não disponível."""
-        lo = self._read_ec(lo_reg)
+    def _read_fan_rpm_ec(
+        self, lo_reg: int, hi_reg: Optional[int] = None, buf: Optional[Dict[int, int]] = None
+    ) -> Optional[int]:
+        """Lê RPM do EC (8 ou 16-bit), do snapshot buf se dado. Retorna None se não disponível."""
+        read = (lambda reg: _ec_byte(buf, reg)) if buf is not None else self._read_ec
+        lo = read(lo_reg)
         if lo is None:
             return None
         if hi_reg is not None:
-            hi = self._read_ec(hi_reg)
+            hi = read(hi_reg)
             val = (hi << 8) | lo if hi is not None else lo
         else:
             val = lo
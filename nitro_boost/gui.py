@@ -1,8 +1,11 @@
 #!/usr/bin/env python3
 """Nitro 5 Cooler Boost - App desktop (apenas ventoinhas em RPM)."""
 
-import fcntl
+import errno
 import os
+import queue
+import socket
+import struct
 import sys
 import subprocess
 import threading
@@ -11,10 +14,10 @@ from tkinter import ttk, messagebox
 
 try:
     from .core import NitroBoost
-    from .insights import get_all_insights
+    from .insights import close_hwmon_fds, get_all_insights, open_hwmon_fds
 except ImportError:
     from core import NitroBoost
-    from insights import get_all_insights
+    from insights import close_hwmon_fds, get_all_insights, open_hwmon_fds
 
 BG = "#0d0d12"
 CARD = "#16161d"
@@ -27,6 +30,13 @@ BORDER = "#2a2a35"
 TRACK = "#2a2a35"
 THUMB = "#00d4aa"
 
+# Socket AF_UNIX no namespace abstrato (por uid): single instance + pedidos de foco.
+# O namespace abstrato não tem permissões, por isso o uid do outro lado é
+# sempre verificado com SO_PEERCRED.
+INSTANCE_ADDR = f"\0nitro-boost-{os.getuid()}"
+POLL_MS = 2000  # ventoinhas (EC, uma leitura)
+INSIGHTS_MS = 5000  # insights (sensors, nvidia-smi): cadência mais lenta
+
 
 def _card(parent, **kw):
     f = tk.Frame(parent, bg=CARD, highlightbackground=BORDER, highlightthickness=1, **kw)
@@ -47,6 +57,10 @@ class Slider(tk.Frame):
 
         self.canvas = tk.Canvas(self, width=width, height=height, bg=CARD, highlightthickness=0, cursor="hand2")
         self.canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        # Itens criados uma vez; _draw só atualiza as coordenadas
+        self._track_id = self.canvas.create_rectangle(0, 0, 0, 0, fill=TRACK, outline="")
+        self._fill_id = self.canvas.create_rectangle(0, 0, 0, 0, fill=ACCENT_DIM, outline="")
+        self._thumb_id = self.canvas.create_oval(0, 0, 0, 0, fill=THUMB, outline=ACCENT_DIM, width=2)
         self.label = tk.Label(self, text=f"{self._value}%", font=("", 10, "bold"), bg=CARD, fg=ACCENT, width=5)
         self.label.pack(side=tk.LEFT, padx=(10, 0))
 
@@ -54,11 +68,8 @@ class Slider(tk.Frame):
         self.canvas.bind("<B1-Motion>", self._on_drag)
         self.canvas.bind("<ButtonRelease-1>", self._on_release)
         self.canvas.bind("<MouseWheel>", self._on_wheel)
-        self.canvas.bind("<Button-4>", self._on_wheel_linux)
-        self.canvas.bind("<Button-5>", self._on_wheel_linux)
-        self.bind("<MouseWheel>", self._on_wheel)
-        self.bind("<Button-4>", self._on_wheel_linux)
-        self.bind("<Button-5>", self._on_wheel_linux)
+        self.canvas.bind("<Button-4>", self._on_wheel)
+        self.canvas.bind("<Button-5>", self._on_wheel)
         self.canvas.bind("<Configure>", lambda e: self._on_resize(e))
         self._draw()
 
@@ -66,7 +77,10 @@ class Slider(tk.Frame):
         return self._value
 
     def set(self, value):
-        self._value = max(self.from_, min(self.to, int(value)))
+        v = max(self.from_, min(self.to, int(value)))
+        if v == self._value:
+            return
+        self._value = v
         self.label.config(text=f"{self._value}%")
         self._draw()
 
@@ -96,13 +110,12 @@ class Slider(tk.Frame):
             self._draw()
 
     def _draw(self):
-        self.canvas.delete("all")
         w = self._get_width()
         h = self.height // 2
-        self.canvas.create_rectangle(8, h - 4, w - 12, h + 4, fill=TRACK, outline="")
+        self.canvas.coords(self._track_id, 8, h - 4, w - 12, h + 4)
         x = self._value_to_x(self._value)
-        self.canvas.create_rectangle(8, h - 4, x, h + 4, fill=ACCENT_DIM, outline="")
-        self.canvas.create_oval(x - 10, h - 10, x + 10, h + 10, fill=THUMB, outline=ACCENT_DIM, width=2)
+        self.canvas.coords(self._fill_id, 8, h - 4, x, h + 4)
+        self.canvas.coords(self._thumb_id, x - 10, h - 10, x + 10, h + 10)
 
     def _on_click(self, e):
         self._dragging = True
@@ -123,16 +136,13 @@ class Slider(tk.Frame):
             self._draw()
 
     def _on_wheel(self, e):
-        delta = 5 if e.delta > 0 else -5
-        self.set(self._value + delta)
-
-    def _on_wheel_linux(self, e):
-        delta = 5 if e.num == 4 else -5
-        self.set(self._value + delta)
+        # Linux: Button-4/5; Windows/macOS: <MouseWheel> com delta
+        up = e.num == 4 if e.num in (4, 5) else e.delta > 0
+        self.set(self._value + (5 if up else -5))
 
 
 class NitroBoostApp:
-    def __init__(self):
+    def __init__(self, instance_sock=None):
         self.root = tk.Tk()
         self.root.title("Acer Nitro 5 Cooler Boost by IB")
         self.root.configure(bg=BG)
@@ -167,7 +177,23 @@ class NitroBoostApp:
         self._cpu_boost = False
         self._gpu_boost = False
         self._poll_id = None
-        self._lock_fd = None
+        self._insights_poll_id = None
+        self._instance_sock = instance_sock
+        self._available = False
+        self._fan = {}
+        self._last_applied = None  # (cpu_pct, gpu_pct) da última escrita bem-sucedida
+        # Último estado aplicado aos widgets (evita config() repetidos a cada tick)
+        self._last_cpu_label = None
+        self._last_gpu_label = None
+        self._last_boost_state = None
+        self._last_badge = None
+        self._insights = None  # último resultado de get_all_insights()
+        self._hwmon_fds = None  # aberto no worker, no primeiro pedido de insights
+        # Worker único: todo o acesso ao EC e os insights ficam fora do main thread
+        self._req_q = queue.Queue()
+        self._closed = False  # janela a fechar: o worker não devolve mais resultados
+        self._worker = threading.Thread(target=self._worker_loop, daemon=True)
+        self._worker.start()
 
         style = ttk.Style()
         style.theme_use("clam")
@@ -179,14 +205,32 @@ class NitroBoostApp:
         self._center_window()
 
     def _run_async(self, func, on_done):
-        """Executa func() em thread e chama on_done(ok, error_msg) no main thread."""
-        def work():
+        """Executa func() no worker e chama on_done(resultado, error_msg) no main thread."""
+        self._req_q.put((func, on_done))
+
+    def _worker_loop(self):
+        """Processa pedidos por ordem; o resultado volta ao Tk via root.after.
+
+        Os fds do EC e do hwmon só são fechados aqui, depois do último
+        pedido, para nunca serem fechados a meio de uma leitura.
+        """
+        while not self._closed:
+            func, on_done = self._req_q.get()
+            if func is None or self._closed:
+                break
             try:
-                ok = func()
-                self.root.after(0, lambda: on_done(ok, None))
+                result, err = func(), None
             except Exception as e:
-                self.root.after(0, lambda: on_done(False, str(e)))
-        threading.Thread(target=work, daemon=True).start()
+                result, err = False, str(e)
+            if self._closed:
+                break
+            try:
+                self.root.after(0, on_done, result, err)
+            except (RuntimeError, tk.TclError):
+                break  # Janela já fechada
+        self.boost.close()
+        if self._hwmon_fds:
+            close_hwmon_fds(self._hwmon_fds)
 
     def _center_window(self):
         """Abre a janela no centro do ecrã."""
@@ -341,14 +385,15 @@ class NitroBoostApp:
 
     def _check_availability(self):
         ok, msg = self.boost.is_available()
+        self._available = ok
         if ok:
-            self.badge.config(text="Pronto", fg=ACCENT)
+            self._set_badge("Pronto", fg=ACCENT)
             fan = self.boost.get_fan_info()
             self._cpu_boost = fan.get("cpu_cooler_boost") or False
             self._gpu_boost = fan.get("gpu_cooler_boost") or False
             self._update_boost_buttons()
         else:
-            self.badge.config(text="Erro", fg=DANGER)
+            self._set_badge("Erro", fg=DANGER)
             self.auto_btn.config(state=tk.DISABLED)
             self.both_boost_btn.config(state=tk.DISABLED)
             self.cpu_boost_btn.config(state=tk.DISABLED)
@@ -363,15 +408,26 @@ class NitroBoostApp:
                 messagebox.showerror("Nitro Boost", f"Erro: {err}")
                 return
             if ok:
+                self._last_applied = None  # saiu do modo manual
                 self._cpu_boost = False
                 self._gpu_boost = False
                 self._update_boost_buttons()
-                self.badge.config(text="Automático", fg=ACCENT)
+                self._set_badge("Automático", fg=ACCENT)
             else:
                 messagebox.showerror("Nitro Boost", "Falha ao definir modo automático.")
         self._run_async(do, done)
 
+    def _set_badge(self, text, fg):
+        if (text, fg) == self._last_badge:
+            return
+        self._last_badge = (text, fg)
+        self.badge.config(text=text, fg=fg)
+
     def _update_boost_buttons(self):
+        state = (self._cpu_boost, self._gpu_boost)
+        if state == self._last_boost_state:
+            return
+        self._last_boost_state = state
         both_on = self._cpu_boost and self._gpu_boost
         if both_on:
             self.both_boost_btn.config(text="MAX: ON", bg=ACCENT, activebackground=ACCENT_DIM, fg=BG)
@@ -396,11 +452,12 @@ class NitroBoostApp:
                 messagebox.showerror("Nitro Boost", f"Erro: {err}")
                 return
             if ok:
+                self._last_applied = None
                 self._cpu_boost = new_cpu
                 self._gpu_boost = new_gpu
                 self._update_boost_buttons()
-                self.badge.config(
-                    text="Cooler Boost: CPU+GPU" if new_cpu else "Automático",
+                self._set_badge(
+                    "Cooler Boost: CPU+GPU" if new_cpu else "Automático",
                     fg=ACCENT if new_cpu else TEXT_MUTED,
                 )
             else:
@@ -419,9 +476,10 @@ class NitroBoostApp:
                 messagebox.showerror("Nitro Boost", f"Erro: {err}")
                 return
             if ok:
+                self._last_applied = None
                 self._update_boost_buttons()
                 parts = [p for p in ["CPU" if self._cpu_boost else None, "GPU" if self._gpu_boost else None] if p]
-                self.badge.config(text=f"Cooler Boost: {', '.join(parts) or 'OFF'}", fg=ACCENT if parts else TEXT_MUTED)
+                self._set_badge(f"Cooler Boost: {', '.join(parts) or 'OFF'}", fg=ACCENT if parts else TEXT_MUTED)
             else:
                 self._cpu_boost = not new_cpu
                 self._update_boost_buttons()
@@ -440,9 +498,10 @@ class NitroBoostApp:
                 messagebox.showerror("Nitro Boost", f"Erro: {err}")
                 return
             if ok:
+                self._last_applied = None
                 self._update_boost_buttons()
                 parts = [p for p in ["CPU" if self._cpu_boost else None, "GPU" if self._gpu_boost else None] if p]
-                self.badge.config(text=f"Cooler Boost: {', '.join(parts) or 'OFF'}", fg=ACCENT if parts else TEXT_MUTED)
+                self._set_badge(f"Cooler Boost: {', '.join(parts) or 'OFF'}", fg=ACCENT if parts else TEXT_MUTED)
             else:
                 self._gpu_boost = not new_gpu
                 self._update_boost_buttons()
@@ -458,6 +517,9 @@ class NitroBoostApp:
     def _apply_fans(self):
         cpu_pct = self.cpu_slider.get()
         gpu_pct = self.gpu_slider.get()
+        # Nada mudou desde a última escrita e o EC continua em modo manual
+        if (cpu_pct, gpu_pct) == self._last_applied and self._fan.get("mode") == "custom":
+            return
         def do():
             return self.boost.set_custom_fans(cpu_pct, gpu_pct)
         def done(ok, err):
@@ -465,38 +527,43 @@ class NitroBoostApp:
                 messagebox.showerror("Nitro Boost", f"Erro: {err}")
                 return
             if ok:
+                self._last_applied = (cpu_pct, gpu_pct)
                 self._cpu_boost = False
                 self._gpu_boost = False
                 self._update_boost_buttons()
-                self.badge.config(text=f"CPU {cpu_pct}% • GPU {gpu_pct}%", fg=ACCENT)
+                self._set_badge(f"CPU {cpu_pct}% • GPU {gpu_pct}%", fg=ACCENT)
             else:
                 messagebox.showerror("Nitro Boost", "Falha ao definir velocidade. Tente modo Automático.")
         self._run_async(do, done)
 
-    def _poll(self):
-        # Single instance: verificar se outra instância pediu foco
-        focus_file = os.path.expanduser("~/.cache/nitro-boost/focus-request")
-        if os.path.isfile(focus_file):
-            try:
-                os.remove(focus_file)
-            except OSError:
-                pass
-            self.root.lift()
-            self.root.attributes("-topmost", True)
-            self.root.after(100, lambda: self.root.attributes("-topmost", False))
-            self.root.focus_force()
+    def _focus_window(self):
+        """Trazer a janela para a frente."""
+        self.root.lift()
+        self.root.attributes("-topmost", True)
+        self.root.after(100, lambda: self.root.attributes("-topmost", False))
+        self.root.focus_force()
 
-        ok, _ = self.boost.is_available()
-        if not ok:
+    def _on_focus_msg(self, fd, mask):
+        """Outra instância pediu foco (chamado pelo loop do Tk, sem polling)."""
+        try:
+            conn, _ = self._instance_sock.accept()
+        except OSError:
             return
-        fan = self.boost.get_fan_info()
-        if fan.get("cpu_cooler_boost") is not None:
-            self._cpu_boost = fan["cpu_cooler_boost"]
-        if fan.get("gpu_cooler_boost") is not None:
-            self._gpu_boost = fan["gpu_cooler_boost"]
-        self._update_boost_buttons()
-
-        insights = get_all_insights()
+        with conn:
+            if _peer_uid(conn) != os.getuid():
+                return  # Pedido de outro utilizador: ignorar
+        self._focus_window()
+
+    def _get_insights(self):
+        """get_all_insights() com os fds do hwmon (corre no worker, a cada INSIGHTS_MS)."""
+        if self._hwmon_fds is None:
+            # Ler os labels de todos os chips hwmon pode demorar: fica fora do Tk
+            self._hwmon_fds = open_hwmon_fds()
+        return get_all_insights(self._hwmon_fds)
+
+    def _update_fan_labels(self):
+        fan = self._fan
+        insights = self._insights or {}
         cpu_rpm = fan.get("cpu_rpm")
         gpu_rpm = fan.get("gpu_rpm")
         if cpu_rpm is None:
@@ -506,17 +573,56 @@ class NitroBoostApp:
         cpu_temp = insights.get("cpu", {}).get("temperature")
         gpu_temp = insights.get("gpu_temperature") or (insights.get("gpu") or {}).get("temperature")
 
-        self.cpu_rpm_lbl.config(text=f"CPU: {cpu_rpm or '--'} RPM • {cpu_temp or '--'} °C")
-        self.gpu_rpm_lbl.config(text=f"GPU: {gpu_rpm or '--'} RPM • {gpu_temp or '--'} °C")
+        cpu_label = f"CPU: {cpu_rpm or '--'} RPM • {cpu_temp or '--'} °C"
+        gpu_label = f"GPU: {gpu_rpm or '--'} RPM • {gpu_temp or '--'} °C"
+        if cpu_label != self._last_cpu_label:
+            self._last_cpu_label = cpu_label
+            self.cpu_rpm_lbl.config(text=cpu_label)
+        if gpu_label != self._last_gpu_label:
+            self._last_gpu_label = gpu_label
+            self.gpu_rpm_lbl.config(text=gpu_label)
+
+    def _poll_fans(self):
+        if not self._available:
+            return
+        self._run_async(self.boost.get_fan_info, self._apply_fan_info)
+
+    def _apply_fan_info(self, fan, err):
+        if err or not fan:
+            self._poll_id = self.root.after(POLL_MS, self._poll_fans)
+            return
+        self._fan = fan
+        if fan.get("cpu_cooler_boost") is not None:
+            self._cpu_boost = fan["cpu_cooler_boost"]
+        if fan.get("gpu_cooler_boost") is not None:
+            self._gpu_boost = fan["gpu_cooler_boost"]
+        self._update_boost_buttons()
+        self._update_fan_labels()
 
         if fan.get("mode") == "custom" and fan.get("cpu_percent") is not None and fan.get("gpu_percent") is not None:
-            self.cpu_slider.set(fan["cpu_percent"])
-            self.gpu_slider.set(fan["gpu_percent"])
+            if self.cpu_slider.get() != fan["cpu_percent"]:
+                self.cpu_slider.set(fan["cpu_percent"])
+            if self.gpu_slider.get() != fan["gpu_percent"]:
+                self.gpu_slider.set(fan["gpu_percent"])
+
+        self._poll_id = self.root.after(POLL_MS, self._poll_fans)
+
+    def _poll_insights(self):
+        if not self._available:
+            return
+        self._run_async(self._get_insights, self._apply_insights)
 
-        self._poll_id = self.root.after(2000, self._poll)
+    def _apply_insights(self, insights, err):
+        if not err:
+            self._insights = insights
+            self._update_fan_labels()
+        self._insights_poll_id = self.root.after(INSIGHTS_MS, self._poll_insights)
 
     def _start_poll(self):
-        self.root.after(500, self._poll)
+        if self._instance_sock is not None:
+            self.root.tk.createfilehandler(self._instance_sock, tk.READABLE, self._on_focus_msg)
+        self.root.after(500, self._poll_fans)
+        self.root.after(500, self._poll_insights)
 
     def run(self):
         self.root.protocol("WM_DELETE_WINDOW", self._on_close)
@@ -525,33 +631,61 @@ class NitroBoostApp:
     def _on_close(self):
         if self._poll_id:
             self.root.after_cancel(self._poll_id)
-        if hasattr(self, "_lock_fd") and self._lock_fd is not None:
+        if self._insights_poll_id:
+            self.root.after_cancel(self._insights_poll_id)
+        if self._instance_sock is not None:
             try:
-                fcntl.flock(self._lock_fd, fcntl.LOCK_UN)
-                os.close(self._lock_fd)
-            except (OSError, AttributeError):
+                self.root.tk.deletefilehandler(self._instance_sock)
+            except tk.TclError:
                 pass
+            self._instance_sock.close()
+            self._instance_sock = None
+        # Sem join: o worker (daemon) vê _closed e fecha os fds quando sair
+        self._closed = True
+        self._req_q.put((None, None))
         self.root.destroy()
 
 
+def _peer_uid(sock):
+    """uid do processo do outro lado de um socket AF_UNIX ligado (SO_PEERCRED)."""
+    creds = sock.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED, struct.calcsize("3i"))
+    return struct.unpack("3i", creds)[1]
+
+
 def _try_single_instance():
-    """Retorna (lock_fd, True) se somos a única instância, ou (None, False) se outra já corre."""
-    cache_dir = os.path.expanduser("~/.cache/nitro-boost")
-    lock_path = os.path.join(cache_dir, ".lock")
-    focus_path = os.path.join(cache_dir, "focus-request")
-    os.makedirs(cache_dir, mode=0o700, exist_ok=True)
+    """Retorna (sock, True) se somos a única instância, ou (None, False) se outra já corre.
+
+    O endereço abstrato é libertado pelo kernel quando o processo termina,
+    sem ficheiros de lock nem de pedido de foco. Se o endereço estiver
+    ocupado por um processo de outro utilizador, arranca-se sem single
+    instance em vez de sair.
+    """
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
     try:
-        fd = os.open(lock_path, os.O_CREAT | os.O_RDWR, 0o600)
-        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
-        os.write(fd, str(os.getpid()).encode())
-        return fd, True
-    except (OSError, BlockingIOError):
-        # Outra instância tem o lock - pedir foco
-        try:
-            open(focus_path, "w").close()
-        except OSError:
-            pass
+        sock.bind(INSTANCE_ADDR)
+    except OSError as e:
+        sock.close()
+        if e.errno != errno.EADDRINUSE:
+            raise
+        # Outra instância já tem o endereço - pedir foco se for mesmo nossa
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as s:
+            s.settimeout(1.0)
+            try:
+                s.connect(INSTANCE_ADDR)
+                same_user = _peer_uid(s) == os.getuid()
+            except OSError:
+                return None, True  # Ninguém a escutar (p.ex. socket dgram alheio)
+            if not same_user:
+                return None, True  # Endereço usurpado por outro utilizador
+            # A instância é nossa: sair mesmo que o pedido de foco falhe
+            try:
+                s.sendall(b"focus")
+            except OSError:
+                pass
         return None, False
+    sock.listen(4)
+    sock.setblocking(False)
+    return sock, True
 
 
 def main():
@@ -568,17 +702,16 @@ def main():
         print("Execute com sudo: sudo nitro-boost --gui")
         sys.exit(1)
 
-    lock_fd = None
+    instance_sock = None
     try:
-        lock_fd, is_first = _try_single_instance()
+        instance_sock, is_first = _try_single_instance()
         if not is_first:
             sys.exit(0)  # Outra instância vai receber o foco
     except Exception:
-        lock_fd = None  # Continuar mesmo se o lock falhar
+        instance_sock = None  # Continuar mesmo se o socket falhar
 
     try:
-        app = NitroBoostApp()
-        app._lock_fd = lock_fd
+        app = NitroBoostApp(instance_sock)
         app.run()
     except Exception as e:
         import traceback
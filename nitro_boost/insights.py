@@ -1,35 +1,193 @@
 #!/usr/bin/env python3
 """System insights: temperatures, GPU, power, etc."""
 
+import atexit
+import concurrent.futures
+import csv
+import functools
+import io
+import json
 import os
 import re
+import selectors
+import signal
 import subprocess
-from typing import Any, Dict, List, Optional
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+try:
+    import pynvml  # opcional (nvidia-ml-py); sem ele usa-se nvidia-smi
+except ImportError:
+    pynvml = None
+
+HWMON_PATH = "/sys/class/hwmon"
+PROC_STAT = "/proc/stat"
+PROC_UPTIME = "/proc/uptime"
+CPU_FREQ_PATH = "/sys/devices/system/cpu/cpu0/cpufreq/scaling_cur_freq"
+THERMAL_PATH = "/sys/class/thermal"
+PROC_CPUINFO = "/proc/cpuinfo"
+# Leitura de scaling_cur_freq acima disto (ns) = driver lento: usar /proc/cpuinfo
+FREQ_SLOW_NS = 500_000
+FREQ_SLOW_STREAK = 3  # leituras lentas seguidas antes de mudar para /proc/cpuinfo
+FREQ_RETRY_CALLS = 30  # chamadas via /proc/cpuinfo antes de voltar a testar o sysfs
+
+_RE_SENSOR_INPUT = re.compile(r"(temp|fan)(\d+)_input:\s*([\d.]+)")
+_RE_TEMP_HUMAN = re.compile(r"([^:]+):\s*\+?([\d.]+)°C")
+_RE_FAN_RPM = re.compile(r"([^:]+fan[^:]*):\s*(\d+)\s*RPM", re.I)
+_RE_HWMON_INPUT = re.compile(r"(temp|fan)(\d+)_input$")
+
+MAX_TEMPS = 12
+
+# Marcadores para classificar temperaturas (label / chip)
+_CPU_LBL_KEYS = ("core", "package", "cpu", "k10")
+_CPU_CHIP_KEYS = ("coretemp", "k10temp", "zenpower")
+_GPU_LBL_KEYS = ("gpu", "nvidia", "amdgpu")
+# NITRO_DEBUG=1: incluir o início da saída do lm-sensors em "raw"
+DEBUG = bool(os.environ.get("NITRO_DEBUG"))
+
+NVSMI_FIELDS = "name,temperature.gpu,utilization.gpu,memory.used,memory.total,power.draw"
+# Igual à cadência dos insights na GUI (INSIGHTS_MS): amostrar mais depressa
+# só impediria a dGPU de desligar em portáteis com gráficos híbridos
+NVSMI_LOOP_MS = 5000
+NVSMI_STALE_INTERVALS = 3  # sem amostras novas durante N intervalos: nvidia-smi pendurado
+
+# (tipo "temp"/"fan", índice, label, chip, fd)
+HwmonFd = Tuple[str, int, str, str, int]
+
+
+_ttl_store: Dict[Tuple[Callable, tuple], Tuple[float, Any]] = {}
+
+
+def _ttl_cache(ttl: float):
+    """Memoriza o resultado (por argumentos) durante ttl segundos."""
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args):
+            key = (fn, args)
+            now = time.monotonic()
+            hit = _ttl_store.get(key)
+            if hit is not None and now - hit[0] < ttl:
+                return hit[1]
+            value = fn(*args)
+            _ttl_store[key] = (now, value)
+            return value
+        return wrapper
+    return decorator
 
 
 def _run(cmd: List[str], timeout: float = 2.0) -> Optional[str]:
+    """Executa cmd e devolve o stdout se terminar com 0 dentro de timeout.
+
+    Usa posix_spawn (vfork+exec) em vez de fork: não copia as tabelas de
+    páginas do processo, que cresce com o Tk e as threads. O filho corre
+    numa sessão própria para que o SIGKILL do timeout apanhe também os
+    processos que ele tenha lançado.
+    """
+    r, w = os.pipe()
     try:
-        r = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            timeout=timeout,
-        )
-        return r.stdout.strip() if r.returncode == 0 else None
-    except (subprocess.TimeoutExpired, FileNotFoundError, OSError):
+        pid = os.posix_spawnp(cmd[0], cmd, os.environ, file_actions=[
+            (os.POSIX_SPAWN_DUP2, w, 1),
+            (os.POSIX_SPAWN_OPEN, 2, os.devnull, os.O_WRONLY, 0),
+        ], setsid=True)
+    except OSError:
+        os.close(r)
+        os.close(w)
+        return None
+    os.close(w)
+
+    deadline = time.monotonic() + timeout
+    chunks = []
+    timed_out = False
+    try:
+        with selectors.DefaultSelector() as sel:
+            sel.register(r, selectors.EVENT_READ)
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    timed_out = True
+                    break
+                if not sel.select(remaining):
+                    continue
+                data = os.read(r, 65536)
+                if not data:
+                    break
+                chunks.append(data)
+    finally:
+        os.close(r)
+
+    status = None
+    while not timed_out:
+        done, status = os.waitpid(pid, os.WNOHANG)
+        if done:
+            break
+        if time.monotonic() >= deadline:
+            timed_out = True
+        else:
+            time.sleep(0.005)
+    if timed_out:
+        try:
+            os.killpg(pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+        os.waitpid(pid, 0)
+        return None
+    if os.waitstatus_to_exitcode(status) != 0:
         return None
+    return b"".join(chunks).decode(errors="replace").strip()
+
+
+def _parse_sensors_json(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Temperaturas e fans de `sensors -j` (chip -> feature -> {tempN_input: valor})."""
+    temps: List[Dict[str, Any]] = []
+    fans = []
+    for chip, features in data.items():
+        if not isinstance(features, dict):
+            continue
+        for label, values in features.items():
+            if not isinstance(values, dict):
+                continue  # p.ex. "Adapter"
+            for key, val in values.items():
+                if not key.endswith("_input") or not isinstance(val, (int, float)):
+                    continue
+                if key.startswith("temp"):
+                    if len(temps) < MAX_TEMPS:
+                        temps.append({"label": label, "value": round(float(val), 1), "chip": chip})
+                elif key.startswith("fan"):
+                    try:
+                        fans.append({"fan": int(key[3:-6]), "rpm": int(val)})
+                    except ValueError:
+                        pass
+    return {"temps": temps, "fans": fans}
 
 
 def get_sensors() -> Dict[str, Any]:
     """Parse lm-sensors output for temperatures."""
+    # JSON (lm-sensors >= 3.5): sem regex nem segundo subprocesso
+    out = _run(["sensors", "-j"])
+    if out:
+        try:
+            data = json.loads(out)
+        except ValueError:
+            data = None
+        raw = out[:500] if DEBUG else None
+        del out
+        if isinstance(data, dict):
+            result = _parse_sensors_json(data)
+            if result["temps"] or result["fans"]:
+                result["raw"] = raw
+                return result
+
+    # Fallback: versões antigas sem -j
     out = _run(["sensors", "-u"])
     if not out:
         return {"temps": [], "raw": None}
 
     temps: List[Dict[str, Any]] = []
+    fans = []
     current_chip = ""
-    current_label = ""
 
+    # Uma só passagem: temperaturas e fans (tempN_input / fanN_input)
     for line in out.splitlines():
         line = line.strip()
         if not line:
@@ -38,27 +196,31 @@ def get_sensors() -> Dict[str, Any]:
             pass
         elif ":" not in line:
             current_chip = line
-        elif ":" in line and "_input:" in line:
-            # e.g. temp1_input: 45.000
-            match = re.match(r"(\w+)_input:\s*([\d.]+)", line)
+        elif "_input:" in line:
+            # e.g. temp1_input: 45.000 / fan1_input: 2100.000
+            match = _RE_SENSOR_INPUT.match(line)
             if match:
-                name, val = match.groups()
+                kind, idx, val = match.groups()
                 try:
                     val_f = float(val)
-                    label = name.replace("temp", "Temp ").replace("_", " ")
+                except ValueError:
+                    continue
+                if kind == "fan":
+                    fans.append({"fan": int(idx), "rpm": int(val_f)})
+                elif len(temps) < MAX_TEMPS:
                     temps.append({
-                        "label": label,
+                        "label": f"Temp {idx}",
                         "value": round(val_f, 1),
                         "chip": current_chip or "unknown",
                     })
-                except ValueError:
-                    pass
 
     # Fallback: parse human-readable sensors output
     if not temps:
         out = _run(["sensors"])
         if out:
-            for m in re.finditer(r"([^:]+):\s*\+?([\d.]+)°C", out):
+            for m in _RE_TEMP_HUMAN.finditer(out):
+                if len(temps) >= MAX_TEMPS:
+                    break
                 label, val = m.groups()
                 try:
                     temps.append({
@@ -68,67 +230,372 @@ def get_sensors() -> Dict[str, Any]:
                     })
                 except ValueError:
                     pass
+            # Fan RPM ("CPU fan: 2100 RPM"), só se o -u não encontrou fans
+            if not fans:
+                for m in _RE_FAN_RPM.finditer(out):
+                    fans.append({"label": m.group(1).strip(), "rpm": int(m.group(2))})
+
+    # Só o excerto de debug sobrevive; a saída completa é libertada já
+    raw = out[:500] if DEBUG and out else None
+    del out
+    return {"temps": temps, "fans": fans, "raw": raw}
 
-    # Fan RPM (fan1_input, fan2_input em RPM)
+
+def _read_text(path: str) -> Optional[str]:
+    try:
+        with open(path, "r") as f:
+            return f.read().strip()
+    except (IOError, OSError):
+        return None
+
+
+def open_hwmon_fds() -> List[HwmonFd]:
+    """Abre uma vez os temp*_input / fan*_input de /sys/class/hwmon para leitura com pread."""
+    entries: List[HwmonFd] = []
+    try:
+        chips = sorted(e.path for e in os.scandir(HWMON_PATH) if e.name.startswith("hwmon"))
+    except OSError:
+        return entries
+    for chip_path in chips:
+        chip = _read_text(os.path.join(chip_path, "name")) or os.path.basename(chip_path)
+        try:
+            names = [e.name for e in os.scandir(chip_path) if e.name.endswith("_input")]
+        except OSError:
+            continue
+        found = []
+        for name in names:
+            match = _RE_HWMON_INPUT.match(name)
+            if match:
+                found.append((match.group(1), int(match.group(2)), name))
+        for kind, idx, name in sorted(found):
+            label = _read_text(os.path.join(chip_path, f"{kind}{idx}_label")) or f"{kind.capitalize()} {idx}"
+            try:
+                fd = os.open(os.path.join(chip_path, name), os.O_RDONLY)
+            except OSError:
+                continue
+            entries.append((kind, idx, label, chip, fd))
+    return entries
+
+
+def close_hwmon_fds(hwmon_fds: List[HwmonFd]) -> None:
+    """Fecha os fds abertos por open_hwmon_fds."""
+    for entry in hwmon_fds:
+        try:
+            os.close(entry[4])
+        except OSError:
+            pass
+    hwmon_fds.clear()
+
+
+def read_hwmon(hwmon_fds: List[HwmonFd]) -> Dict[str, Any]:
+    """Lê temperaturas e fans dos fds hwmon (mesmo formato de get_sensors)."""
+    temps: List[Dict[str, Any]] = []
     fans = []
-    if out:
-        for m in re.finditer(r"fan(\d+)_input:\s*([\d.]+)", out):
-            fans.append({"fan": int(m.group(1)), "rpm": int(float(m.group(2)))})
-        for m in re.finditer(r"([^:]+fan[^:]*):\s*(\d+)\s*RPM", out, re.I):
-            fans.append({"label": m.group(1).strip(), "rpm": int(m.group(2))})
+    for kind, idx, label, chip, fd in hwmon_fds:
+        try:
+            raw = os.pread(fd, 16, 0)
+        except OSError:
+            continue
+        if kind == "temp":
+            # Sem o sensors.conf nada filtra leituras absurdas (0, -273, 127 °C...)
+            val = _millideg_to_c(raw)
+            if val is not None and len(temps) < MAX_TEMPS:
+                temps.append({"label": label, "value": val, "chip": chip})
+        else:
+            try:
+                fans.append({"fan": idx, "rpm": int(raw)})
+            except ValueError:
+                continue
+    return {"temps": temps, "fans": fans, "raw": None}
 
-    return {"temps": temps[:12], "fans": fans, "raw": out[:500] if out else None}
 
+_nvml_ready: Optional[bool] = None  # None = NVML ainda não inicializado
+_nvml_handles: List[Any] = []
 
-def get_nvidia_gpu() -> Optional[Dict[str, Any]]:
-    """Get NVIDIA GPU info via nvidia-smi."""
-    out = _run([
-        "nvidia-smi",
-        "--query-gpu=name,temperature.gpu,utilization.gpu,memory.used,memory.total,power.draw",
-        "--format=csv,noheader,nounits",
-    ])
-    if not out:
+
+def _nvml_init() -> bool:
+    """Inicializa NVML uma vez por processo e guarda os handles das GPUs."""
+    global _nvml_ready, _nvml_handles
+    if _nvml_ready is None:
+        _nvml_ready = False
+        if pynvml is not None:
+            try:
+                pynvml.nvmlInit()
+                atexit.register(pynvml.nvmlShutdown)
+                _nvml_handles = [
+                    pynvml.nvmlDeviceGetHandleByIndex(i)
+                    for i in range(pynvml.nvmlDeviceGetCount())
+                ]
+                _nvml_ready = True
+            except pynvml.NVMLError:
+                pass
+    return _nvml_ready
+
+
+def _nvml_query(fn, *args):
+    try:
+        return fn(*args)
+    except pynvml.NVMLError:
+        return None
+
+
+@_ttl_cache(60.0)
+def _gpu_static(index: int) -> Dict[str, Any]:
+    """Nome e memória total da GPU (praticamente constantes).
+
+    Indexado pelo índice da GPU: os handles NVML (ctypes) não são hashable.
+    """
+    handle = _nvml_handles[index]
+    name = _nvml_query(pynvml.nvmlDeviceGetName, handle)
+    if isinstance(name, bytes):
+        name = name.decode(errors="replace")
+    mem = _nvml_query(pynvml.nvmlDeviceGetMemoryInfo, handle)
+    return {
+        "name": name,
+        "memory_total_mb": mem.total // (1024 * 1024) if mem is not None else None,
+    }
+
+
+def _gpu_dynamic(handle) -> Dict[str, Any]:
+    """Temperatura, utilização, memória usada e potência (a cada chamada)."""
+    temp = _nvml_query(pynvml.nvmlDeviceGetTemperature, handle, pynvml.NVML_TEMPERATURE_GPU)
+    util = _nvml_query(pynvml.nvmlDeviceGetUtilizationRates, handle)
+    mem = _nvml_query(pynvml.nvmlDeviceGetMemoryInfo, handle)
+    power = _nvml_query(pynvml.nvmlDeviceGetPowerUsage, handle)  # mW
+    return {
+        "temperature": temp,
+        "utilization": util.gpu if util is not None else None,
+        "memory_used_mb": mem.used // (1024 * 1024) if mem is not None else None,
+        "power_watts": round(power / 1000.0, 1) if power else None,
+    }
+
+
+def _nvml_gpu(index: int) -> Dict[str, Any]:
+    """GPU info via NVML (mesmo formato do caminho nvidia-smi)."""
+    static = _gpu_static(index)
+    dynamic = _gpu_dynamic(_nvml_handles[index])
+    return {
+        "name": static["name"],
+        "temperature": dynamic["temperature"],
+        "utilization": dynamic["utilization"],
+        "memory_used_mb": dynamic["memory_used_mb"],
+        "memory_total_mb": static["memory_total_mb"],
+        "power_watts": dynamic["power_watts"],
+    }
+
+
+class _NvSmiStream:
+    """nvidia-smi em modo loop (-lms): um único processo, lê-se a amostra mais recente."""
+
+    def __init__(self, interval_ms: int = NVSMI_LOOP_MS):
+        self._cmd = [
+            "nvidia-smi",
+            "--query-gpu=index," + NVSMI_FIELDS,
+            "--format=csv,noheader,nounits",
+            "-lms", str(interval_ms),
+        ]
+        self._max_age = interval_ms / 1000.0 * NVSMI_STALE_INTERVALS
+        self._proc: Optional[subprocess.Popen] = None
+        self._lock = threading.Lock()
+        # índice da GPU -> (time.monotonic() da amostra, linha CSV sem o índice)
+        self._latest: Dict[str, Tuple[float, str]] = {}
+        self._first = threading.Event()
+        self.failed = False
+        self._stop_registered = False
+
+    def _start(self) -> None:
+        try:
+            self._proc = subprocess.Popen(
+                self._cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL
+            )
+        except OSError:
+            self.failed = True
+            return
+        if not self._stop_registered:
+            atexit.register(self.stop)
+            self._stop_registered = True
+        threading.Thread(target=self._reader, args=(self._proc,), daemon=True).start()
+
+    def _reader(self, proc: subprocess.Popen) -> None:
+        for raw in proc.stdout:
+            idx, sep, rest = raw.decode(errors="replace").strip().partition(",")
+            if sep:
+                with self._lock:
+                    if proc is not self._proc:
+                        return  # processo substituído pelo watchdog
+                    self._latest[idx] = (time.monotonic(), rest)
+                self._first.set()
+        self._first.set()  # EOF: processo terminou
+
+    def latest(self, timeout: float = 2.0) -> Optional[str]:
+        """Última amostra (uma linha por GPU), como a saída de nvidia-smi sem -lms."""
+        if self.failed:
+            return None
+        if self._proc is not None and self._proc.poll() is not None:
+            # Terminou: reinicia se já tinha produzido dados, senão desiste
+            with self._lock:
+                had_data = bool(self._latest)
+                self._latest = {}
+            self._first.clear()
+            self._proc = None
+            if not had_data:
+                self.failed = True
+                return None
+        if self._proc is None:
+            self._start()
+            if self.failed:
+                return None
+        self._first.wait(timeout)
+        with self._lock:
+            if not self._latest:
+                return None
+            newest = max(ts for ts, _ in self._latest.values())
+            stale = time.monotonic() - newest > self._max_age
+            if not stale:
+                rows = sorted(self._latest.items(), key=lambda kv: int(kv[0]) if kv[0].isdigit() else -1)
+        if stale:
+            # Watchdog: nvidia-smi deixou de produzir amostras; reinicia na próxima chamada
+            self.stop()
+            return None
+        return "\n".join(line for _, (_, line) in rows)
+
+    def stop(self) -> None:
+        with self._lock:
+            proc, self._proc = self._proc, None
+            self._latest = {}
+        self._first.clear()
+        if proc is not None and proc.poll() is None:
+            proc.terminate()
+            try:
+                proc.wait(timeout=1)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+
+
+_nvsmi_stream = _NvSmiStream()
+
+
+def _nvsmi_int(field: str) -> Optional[int]:
+    """Campo numérico de nvidia-smi como int ("[N/A]"/"[Not Supported]" -> None)."""
+    field = field.strip()
+    if not field or field[0] == "[":
         return None
+    return int(field.split(".", 1)[0])
 
-    parts = [p.strip() for p in out.split(",")]
-    if len(parts) < 4:
+
+def _nvsmi_float(field: str) -> Optional[float]:
+    field = field.strip()
+    if not field or field[0] == "[":
         return None
+    return float(field)
+
+
+def _parse_nvidia_smi(out: str) -> List[Dict[str, Any]]:
+    """Parse do CSV de nvidia-smi --query-gpu=NVSMI_FIELDS (uma linha por GPU)."""
+    gpus = []
+    for row in csv.reader(io.StringIO(out), skipinitialspace=True):
+        if len(row) != 6:
+            continue
+        name, temp, util, mem_used, mem_total, power = row
+        try:
+            power_w = _nvsmi_float(power)
+            gpus.append({
+                "name": name.strip(),
+                "temperature": _nvsmi_int(temp),
+                "utilization": _nvsmi_int(util),
+                "memory_used_mb": _nvsmi_int(mem_used),
+                "memory_total_mb": _nvsmi_int(mem_total),
+                "power_watts": round(power_w, 1) if power_w else None,
+            })
+        except ValueError:
+            continue
+    return gpus
+
 
+def get_nvidia_gpus() -> List[Dict[str, Any]]:
+    """Get info for every NVIDIA GPU via NVML (pynvml), or nvidia-smi if unavailable.
+
+    Sem NVML, um nvidia-smi persistente em modo loop evita um fork por
+    chamada; só se este falhar se executa nvidia-smi a cada chamada.
+    """
+    if _nvml_init():
+        return [_nvml_gpu(i) for i in range(len(_nvml_handles))]
+    out = _nvsmi_stream.latest()
+    if out is None and _nvsmi_stream.failed:
+        out = _run([
+            "nvidia-smi",
+            "--query-gpu=" + NVSMI_FIELDS,
+            "--format=csv,noheader,nounits",
+        ])
+    if not out:
+        return []
+    return _parse_nvidia_smi(out)
+
+
+def get_nvidia_gpu() -> Optional[Dict[str, Any]]:
+    """Get NVIDIA GPU info (primeira GPU)."""
+    gpus = get_nvidia_gpus()
+    return gpus[0] if gpus else None
+
+
+_fd_cache: Dict[str, int] = {}
+_fd_missing: set = set()  # caminhos que falharam no open: não voltar a tentar
+
+
+def _cached_fd(path: str) -> Optional[int]:
+    """fd mantido aberto para path, ou None se o ficheiro não abre."""
+    fd = _fd_cache.get(path)
+    if fd is None and path not in _fd_missing:
+        try:
+            fd = os.open(path, os.O_RDONLY)
+        except OSError:
+            _fd_missing.add(path)
+            return None
+        _fd_cache[path] = fd
+    return fd
+
+
+def _pread_path(path: str, size: int = 4096) -> Optional[bytes]:
+    """Relê um ficheiro de /proc ou /sys com pread num fd mantido aberto."""
+    fd = _cached_fd(path)
+    if fd is None:
+        return None
     try:
-        name = parts[0].strip('"')
-        temp = int(float(parts[1])) if parts[1] != "[N/A]" else None
-        util = int(float(parts[2])) if len(parts) > 2 and parts[2] != "[N/A]" else None
-        mem_used = int(float(parts[3])) if len(parts) > 3 and parts[3] != "[N/A]" else None
-        mem_total = int(float(parts[4])) if len(parts) > 4 and parts[4] != "[N/A]" else None
-        power = float(parts[5]) if len(parts) > 5 and parts[5] != "[N/A]" else None
-
-        return {
-            "name": name,
-            "temperature": temp,
-            "utilization": util,
-            "memory_used_mb": mem_used,
-            "memory_total_mb": mem_total,
-            "power_watts": round(power, 1) if power else None,
-        }
-    except (ValueError, IndexError):
+        return os.pread(fd, size, 0)
+    except OSError:
+        _fd_cache.pop(path, None)
+        os.close(fd)
         return None
 
 
+@atexit.register
+def _close_cached_fds() -> None:
+    while _fd_cache:
+        _, fd = _fd_cache.popitem()
+        try:
+            os.close(fd)
+        except OSError:
+            pass
+
+
 _prev_stat = None
 
 
 def get_cpu_usage() -> Optional[float]:
     """Get CPU usage percentage from /proc/stat (requires two samples)."""
     global _prev_stat
+    data = _pread_path(PROC_STAT)
+    if not data:
+        return None
     try:
-        with open("/proc/stat", "r") as f:
-            first = f.readline()
-        parts = first.split()
+        first = data.split(b"\n", 1)[0]
+        parts = first.split(None, 8)
         if len(parts) < 8:
             return None
         # user, nice, system, idle, iowait, irq, softirq, steal
-        total = sum(int(x) for x in parts[1:8])
-        idle = int(parts[4])
+        vals = list(map(int, parts[1:8]))
+        total = sum(vals)
+        idle = vals[3]
         curr = (total, idle)
         if _prev_stat is not None:
             dt = total - _prev_stat[0]
@@ -138,54 +605,118 @@ def get_cpu_usage() -> Optional[float]:
                 return round(100 * (1 - di / dt), 1)
         _prev_stat = curr
         return None  # First sample
-    except (IOError, ValueError):
+    except ValueError:
         return None
 
 
-def get_cpu_temp_thermal() -> Optional[float]:
-    """Lê temperatura CPU de /sys/class/thermal (fallback)."""
+def _millideg_to_c(raw: Union[str, bytes, None]) -> Optional[float]:
+    """Converte millidegrees de sysfs; None se inválido (fora de 0-150°C)."""
     try:
-        import glob
-        for path in sorted(glob.glob("/sys/class/thermal/thermal_zone*/temp")):
-            try:
-                with open(path, "r") as f:
-                    val = int(f.read().strip())
-                if 0 < val < 150000:  # 0-150°C em millidegrees
-                    return round(val / 1000, 1)
-            except (IOError, ValueError):
-                continue
-        for path in sorted(glob.glob("/sys/class/thermal/thermal_zone*")):
-            type_path = path + "/type"
-            temp_path = path + "/temp"
+        val = int(raw)
+    except (TypeError, ValueError):
+        return None
+    return round(val / 1000, 1) if 0 < val < 150000 else None
+
+
+def _find_cpu_thermal_zone() -> Optional[str]:
+    """Escolhe o ficheiro temp da CPU: zona pkg/cpu/x86, senão a primeira válida."""
+    try:
+        with os.scandir(THERMAL_PATH) as it:
+            zones = sorted(e.path for e in it if e.name.startswith("thermal_zone"))
+    except OSError:
+        return None
+    first_valid = None
+    for path in zones:
+        temp_path = path + "/temp"
+        if _millideg_to_c(_read_text(temp_path)) is None:
+            continue
+        t = (_read_text(path + "/type") or "").lower()
+        if "pkg" in t or "cpu" in t or "x86" in t:
+            return temp_path
+        if first_valid is None:
+            first_valid = temp_path
+    return first_valid
+
+
+_cpu_thermal_path: Optional[str] = None
+_cpu_thermal_searched = False
+
+
+def get_cpu_temp_thermal() -> Optional[float]:
+    """Lê temperatura CPU de /sys/class/thermal (fallback).
+
+    A zona é escolhida na primeira chamada; depois é só um pread.
+    """
+    global _cpu_thermal_path, _cpu_thermal_searched
+    if not _cpu_thermal_searched:
+        _cpu_thermal_searched = True
+        _cpu_thermal_path = _find_cpu_thermal_zone()
+    if _cpu_thermal_path is None:
+        return None
+    return _millideg_to_c(_pread_path(_cpu_thermal_path, 32))
+
+
+def _cpuinfo_freq() -> Optional[float]:
+    """Frequência (MHz) da primeira CPU em /proc/cpuinfo."""
+    data = _pread_path(PROC_CPUINFO)
+    if not data:
+        return None
+    for line in data.splitlines():
+        if line.startswith(b"cpu MHz"):
             try:
-                with open(type_path, "r") as f:
-                    t = f.read().strip().lower()
-                if "pkg" in t or "cpu" in t or "x86" in t:
-                    with open(temp_path, "r") as f:
-                        val = int(f.read().strip())
-                    if 0 < val < 150000:
-                        return round(val / 1000, 1)
-            except (IOError, ValueError):
-                continue
-    except Exception:
-        pass
+                return round(float(line.split(b":", 1)[1]), 0)
+            except (IndexError, ValueError):
+                return None
     return None
 
 
+_freq_cpuinfo_calls = 0  # > 0: scaling_cur_freq foi lento, usar /proc/cpuinfo
+_freq_slow_reads = 0  # leituras lentas seguidas de scaling_cur_freq
+
+
 def get_cpu_freq() -> Optional[float]:
-    """Get current CPU frequency in MHz."""
+    """Get current CPU frequency in MHz.
+
+    Em alguns drivers (p.ex. AMD) ler scaling_cur_freq consulta o hardware e
+    demora ms; após FREQ_SLOW_STREAK leituras lentas seguidas usa-se
+    /proc/cpuinfo e o sysfs só é retestado a cada FREQ_RETRY_CALLS chamadas.
+    """
+    global _freq_cpuinfo_calls, _freq_slow_reads
+    if _freq_cpuinfo_calls:
+        _freq_cpuinfo_calls = (_freq_cpuinfo_calls + 1) % FREQ_RETRY_CALLS
+        return _cpuinfo_freq()
+    fd = _cached_fd(CPU_FREQ_PATH)
+    if fd is None:
+        return _cpuinfo_freq()
+    # Só o pread é cronometrado (o open e a espera pelo GIL não contam)
+    t0 = time.perf_counter_ns()
     try:
-        with open("/sys/devices/system/cpu/cpu0/cpufreq/scaling_cur_freq", "r") as f:
-            return round(int(f.read().strip()) / 1000, 0)
-    except (IOError, ValueError):
+        data = os.pread(fd, 32, 0)
+    except OSError:
+        data = None
+    if time.perf_counter_ns() - t0 > FREQ_SLOW_NS:
+        _freq_slow_reads += 1
+        if _freq_slow_reads >= FREQ_SLOW_STREAK:
+            _freq_slow_reads = 0
+            _freq_cpuinfo_calls = 1
+    else:
+        _freq_slow_reads = 0
+    if not data:
+        return _cpuinfo_freq()
+    try:
+        return round(int(data) / 1000, 0)
+    except ValueError:
         return None
 
 
+@_ttl_cache(5.0)
 def get_uptime() -> Optional[str]:
     """Get system uptime as human string."""
+    data = _pread_path(PROC_UPTIME, 64)
+    if not data:
+        return None
     try:
-        with open("/proc/uptime", "r") as f:
-            secs = float(f.read().split()[0])
+        secs = float(data.split()[0])
         m, s = divmod(int(secs), 60)
         h, m = divmod(m, 60)
         d, h = divmod(h, 24)
@@ -194,17 +725,42 @@ def get_uptime() -> Optional[str]:
         if h > 0:
             return f"{h}h {m}m"
         return f"{m}m {s}s"
-    except (IOError, ValueError):
+    except (ValueError, IndexError):
         return None
 
 
-def get_all_insights() -> Dict[str, Any]:
-    """Aggregate all system insights."""
-    sensors = get_sensors()
-    gpu = get_nvidia_gpu()
+_executor: Optional[concurrent.futures.ThreadPoolExecutor] = None
+
+
+def _get_executor() -> concurrent.futures.ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=2, thread_name_prefix="nitro-insights"
+        )
+    return _executor
+
+
+def get_all_insights(hwmon_fds: Optional[List[HwmonFd]] = None) -> Dict[str, Any]:
+    """Aggregate all system insights.
+
+    hwmon_fds: fds de open_hwmon_fds(); se derem temperaturas, evitam o
+    subprocesso do lm-sensors.
+    """
+    # Coletores lentos (subprocessos) correm em paralelo; /proc e /sys leem-se aqui
+    ex = _get_executor()
+    gpu_future = ex.submit(get_nvidia_gpus)
+    sensors = read_hwmon(hwmon_fds) if hwmon_fds else None
+    sensors_future = None
+    if not sensors or not sensors["temps"]:
+        sensors_future = ex.submit(get_sensors)
     cpu_usage = get_cpu_usage()
     cpu_freq = get_cpu_freq()
     uptime = get_uptime()
+    if sensors_future is not None:
+        sensors = sensors_future.result()
+    gpus = gpu_future.result()
+    gpu = gpus[0] if gpus else None
 
     # Pick main temps
     temps = sensors.get("temps", [])
@@ -217,14 +773,13 @@ def get_all_insights() -> Dict[str, Any]:
         val = t.get("value")
         if first_temp is None and val is not None:
             first_temp = val
-        if "core" in lbl or "package" in lbl or "cpu" in lbl or "k10" in lbl:
-            if cpu_temp is None:
-                cpu_temp = val
-        elif "coretemp" in chip or "k10temp" in chip or "zenpower" in chip:
+        if any(k in lbl for k in _CPU_LBL_KEYS) or any(k in chip for k in _CPU_CHIP_KEYS):
             if cpu_temp is None:
                 cpu_temp = val
-        elif "gpu" in lbl or "nvidia" in lbl or "amdgpu" in lbl:
+        elif any(k in lbl for k in _GPU_LBL_KEYS):
             gpu_temp_from_sensors = val
+        if cpu_temp is not None and gpu_temp_from_sensors is not None:
+            break
     if cpu_temp is None:
         cpu_temp = get_cpu_temp_thermal()
     if cpu_temp is None:
@@ -238,16 +793,17 @@ def get_all_insights() -> Dict[str, Any]:
     fans = sensors.get("fans", [])
     cpu_fan_rpm = None
     gpu_fan_rpm = None
-    for f in fans:
-        if f.get("fan") == 1 or "cpu" in str(f.get("label", "")).lower():
-            cpu_fan_rpm = f.get("rpm")
-        elif f.get("fan") == 2 or "gpu" in str(f.get("label", "")).lower():
-            gpu_fan_rpm = f.get("rpm")
-    if len(fans) == 1:
-        cpu_fan_rpm = fans[0].get("rpm")
-    elif len(fans) >= 2:
+    if len(fans) >= 2:
+        # Posicional: 1ª = CPU, 2ª = GPU
         cpu_fan_rpm = fans[0].get("rpm")
         gpu_fan_rpm = fans[1].get("rpm")
+    elif fans:
+        f = fans[0]
+        cpu_fan_rpm = f.get("rpm")
+        # Única fan identificada como da GPU: mostrar também na GPU
+        label = str(f.get("label", "")).lower()
+        if f.get("fan") != 1 and "cpu" not in label and (f.get("fan") == 2 or "gpu" in label):
+            gpu_fan_rpm = cpu_fan_rpm
 
     return {
         "cpu": {
@@ -256,6 +812,7 @@ def get_all_insights() -> Dict[str, Any]:
             "frequency_mhz": cpu_freq,
         },
         "gpu": gpu,
+        "gpus": gpus,
         "gpu_temperature": gpu_temp if gpu else gpu_temp_from_sensors,
         "temperatures": temps,
         "uptime": uptime,